@@ -1,31 +1,206 @@
-import pandas as pd
-import math
+import csv
+import numpy as np
+from dataclasses import dataclass
 import random
 import sys
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; fall back to plain Python.
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+
+@dataclass
+class SoATasks:
+    """
+    Task set stored column-wise: one int64 array per parameter, indexed by
+    task id (the row order of the CSV). Task names are only needed for output.
+    """
+
+    names: list
+    bcet: np.ndarray
+    wcet: np.ndarray
+    period: np.ndarray
+    deadline: np.ndarray
+    priority: np.ndarray
+
+    def __len__(self):
+        return len(self.names)
+
 
 def load_tasks(filename):
     """
     Loads task parameters from a CSV file.
     The file should contain columns: Task, BCET, WCET, Period, Deadline, Priority.
     """
-    df = pd.read_csv(filename)
-    tasks = []
-    for _, row in df.iterrows():
-        tasks.append(
-            {
-                "Task": row["Task"],
-                "BCET": int(row["BCET"]),
-                "WCET": int(row["WCET"]),
-                "Period": int(row["Period"]),
-                "Deadline": int(row["Deadline"]),
-                "Priority": int(row["Priority"]),
-            }
-        )
-    return tasks
+    with open(filename, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    def column(name):
+        return np.fromiter((int(r[name]) for r in rows), dtype=np.int64, count=len(rows))
+
+    return SoATasks(
+        names=[r["Task"] for r in rows],
+        bcet=column("BCET"),
+        wcet=column("WCET"),
+        period=column("Period"),
+        deadline=column("Deadline"),
+        priority=column("Priority"),
+    )
+
+
+@njit(cache=True)
+def _heap_sift_up(heap, pos, key):
+    """Restore the min-heap order of heap[:pos + 1] after appending heap[pos]."""
+    item = heap[pos]
+    while pos > 0:
+        parent = (pos - 1) >> 1
+        other = heap[parent]
+        if key[item] < key[other] or (key[item] == key[other] and item < other):
+            heap[pos] = other
+            pos = parent
+        else:
+            break
+    heap[pos] = item
+
+
+@njit(cache=True)
+def _heap_sift_down(heap, size, key):
+    """Restore the min-heap order of heap[:size] after heap[0] was replaced."""
+    pos = 0
+    item = heap[0]
+    while True:
+        child = 2 * pos + 1
+        if child >= size:
+            break
+        right = child + 1
+        if right < size and (
+            key[heap[right]] < key[heap[child]]
+            or (key[heap[right]] == key[heap[child]] and heap[right] < heap[child])
+        ):
+            child = right
+        other = heap[child]
+        if key[other] < key[item] or (key[other] == key[item] and other < item):
+            heap[pos] = other
+            pos = child
+        else:
+            break
+    heap[pos] = item
+
+
+@njit(cache=True)
+def _simulate(wcet, period, priority, simulation_time, force_wcet, exec_times):
+    """
+    Compiled event loop behind simulate().
+
+    The k-th job of task i runs for exec_times[i, k] (or wcet[i] when
+    force_wcet is set, in which case exec_times may be empty).
+    Both heaps are int64 arrays of ids ordered by a key array, ties broken by
+    the smaller id: task ids by next release time, and job ids by priority
+    (job ids increase with release time, so equal priorities run FIFO).
+    The release heap holds the pending work and the ready heap exactly the
+    released, unfinished jobs, so no ready list is ever filtered or rebuilt.
+    Returns the worst-case response time per task id.
+    """
+    n_tasks = period.shape[0]
+    worst_response = np.zeros(n_tasks, dtype=np.int64)
+    # Next scheduled release and number of released jobs per task; all
+    # tasks are released at time 0.
+    next_release = np.zeros(n_tasks, dtype=np.int64)
+    n_released = np.zeros(n_tasks, dtype=np.int64)
+    release_heap = np.arange(n_tasks)
+    # Job state as parallel arrays indexed by job id. Every job released
+    # before simulation_time fits, so the arrays never need to grow.
+    max_jobs = 0
+    for i in range(n_tasks):
+        max_jobs += simulation_time // period[i] + 1
+    job_task = np.empty(max_jobs, dtype=np.int64)
+    job_release = np.empty(max_jobs, dtype=np.int64)
+    job_remaining = np.empty(max_jobs, dtype=np.int64)
+    job_priority = np.empty(max_jobs, dtype=np.int64)
+    n_jobs = 0
+    ready_heap = np.empty(max_jobs, dtype=np.int64)
+    n_ready = 0
+
+    # Earliest pending release, kept in a local and only refreshed when the
+    # release heap changes.
+    next_release_event = 0
+    current_time = 0
+    while current_time < simulation_time:
+        # Release new jobs if their release time has arrived.
+        while next_release_event <= current_time:
+            i = release_heap[0]
+            if force_wcet:
+                exec_time = wcet[i]
+            else:
+                exec_time = exec_times[i, n_released[i]]
+            n_released[i] += 1
+            job_task[n_jobs] = i
+            job_release[n_jobs] = next_release[i]
+            job_remaining[n_jobs] = exec_time
+            job_priority[n_jobs] = priority[i]
+            ready_heap[n_ready] = n_jobs
+            _heap_sift_up(ready_heap, n_ready, job_priority)
+            n_ready += 1
+            n_jobs += 1
+            # Schedule the next release for this task.
+            next_release[i] += period[i]
+            _heap_sift_down(release_heap, n_tasks, next_release)
+            next_release_event = next_release[release_heap[0]]
+
+        if n_ready > 0:
+            # Run the highest-priority ready job until it finishes, the next
+            # release arrives or the simulation ends.
+            job = ready_heap[0]
+            event_time = min(
+                current_time + job_remaining[job], next_release_event, simulation_time
+            )
+            job_remaining[job] -= event_time - current_time
+            current_time = event_time
+            # If the job finishes, record its response time and drop it.
+            if job_remaining[job] <= 0:
+                i = job_task[job]
+                worst_response[i] = max(worst_response[i], current_time - job_release[job])
+                n_ready -= 1
+                if n_ready > 0:
+                    ready_heap[0] = ready_heap[n_ready]
+                    _heap_sift_down(ready_heap, n_ready, job_priority)
+        else:
+            # If no jobs are ready, jump to the next release event.
+            current_time = min(next_release_event, simulation_time)
+
+    # Jobs still unfinished at the end count up to the end of the simulation.
+    for k in range(n_ready):
+        job = ready_heap[k]
+        i = job_task[job]
+        worst_response[i] = max(worst_response[i], simulation_time - job_release[job])
+
+    return worst_response
 
 
-def simulate(tasks, simulation_time, force_wcet=False):
+def _draw_exec_times(tasks, simulation_time, rng, num_runs):
+    """
+    Draw the execution time of every job up front, uniformly in [BCET, WCET].
+
+    Returns an int64 array of shape (num_runs, n_tasks, max_jobs), where
+    max_jobs is the largest number of releases any task has before
+    simulation_time.
+    """
+    max_jobs = int((simulation_time // tasks.period).max()) + 1
+    return rng.integers(
+        tasks.bcet[None, :, None],
+        tasks.wcet[None, :, None] + 1,
+        size=(num_runs, len(tasks), max_jobs),
+        dtype=np.int64,
+    )
+
+
+def simulate(tasks, simulation_time, force_wcet=False, seed=None):
     """
     Event-based simulation of fixed-priority preemptive scheduling.
 
@@ -34,80 +209,74 @@ def simulate(tasks, simulation_time, force_wcet=False):
       - The job finishes, or
       - A new job is released that might preempt it.
 
-    The simulation clock is advanced directly to the next event time.
+    The simulation clock is advanced directly to the next event time. The
+    event loop itself runs in the compiled _simulate(); seed makes the random
+    execution times reproducible and is drawn from `random` when omitted.
 
     Returns a dictionary mapping each task name to the worst-case response time (WCRT)
     observed in this simulation run.
     """
-    # Initialize worst-case response times.
-    worst_response = {task["Task"]: 0 for task in tasks}
-    # For each task, track the next scheduled release time.
-    next_release = {task["Task"]: 0 for task in tasks}
-    # List to hold active jobs.
-    jobs = []
-
-    currentTime = 0
-    while currentTime < simulation_time:
-        # Release new jobs if their release time has arrived
-        for task in tasks:
-            task_name = task["Task"]
-            while next_release[task_name] <= currentTime:
-                # Use the scheduled release time as the job's release time.
-                if force_wcet:
-                    exec_time = task["WCET"]
-                else:
-                    exec_time = random.randint(task["BCET"], task["WCET"])
-                job = {
-                    "task": task_name,
-                    "release": next_release[task_name],
-                    "remaining": exec_time,
-                    "priority": task["Priority"],
-                }
-                jobs.append(job)
-                # Schedule the next release for this task.
-                next_release[task_name] += task["Period"]
-
-        # Get all ready jobs (released and not finished)
-        ready_jobs = [
-            job
-            for job in jobs
-            if job["release"] <= currentTime and job["remaining"] > 0
-        ]
-
-        if ready_jobs:
-            # Select the highest-priority ready job (lowest numerical Priority).
-            current_job = min(ready_jobs, key=lambda job: job["priority"])
-            # Compute when this job would finish if it ran uninterrupted.
-            finish_time = currentTime + current_job["remaining"]
-            # Determine the next release event (the earliest among all tasks).
-            next_release_event = min(next_release.values())
-            # The next event time is the earliest of:
-            #   - The current job finishing,
-            #   - The next job release,
-            #   - The simulation end time.
-            event_time = min(finish_time, next_release_event, simulation_time)
-            delta = event_time - currentTime
-            # Run the current job for delta time.
-            current_job["remaining"] -= delta
-            currentTime = event_time
-            # If the job finishes, record its response time.
-            if current_job["remaining"] <= 0:
-                response_time = currentTime - current_job["release"]
-                worst_response[current_job["task"]] = max(
-                    worst_response[current_job["task"]], response_time
-                )
-                jobs.remove(current_job)
-        else:
-            # If no jobs are ready, jump to the next release event.
-            next_release_event = min(next_release.values())
-            currentTime = min(next_release_event, simulation_time)
+    if force_wcet:
+        exec_times = np.empty((len(tasks), 0), dtype=np.int64)
+    else:
+        if seed is None:
+            seed = random.getrandbits(128)
+        rng = np.random.default_rng(seed)
+        exec_times = _draw_exec_times(tasks, simulation_time, rng, 1)[0]
+    worst_response = _simulate(
+        tasks.wcet,
+        tasks.period,
+        tasks.priority,
+        simulation_time,
+        force_wcet,
+        exec_times,
+    )
+    return dict(zip(tasks.names, worst_response.tolist()))
 
-    # After simulation, update worst_response for any jobs still unfinished.
-    for job in jobs:
-        response_time = simulation_time - job["release"]
-        worst_response[job["task"]] = max(worst_response[job["task"]], response_time)
 
-    return worst_response
+@njit(cache=True)
+def _rta_one(periods, wcets, C_i, D_i):
+    """
+    Worst-case response time of a single task from its scheduling points.
+
+    periods/wcets hold the higher-priority tasks only. The workload
+    W(t) = C_i + Σ ceil(t / T_j) * C_j is a step function that only changes
+    right after a multiple of some T_j, so instead of iterating R = W(R) it is
+    enough to walk the merged release timeline {k * T_j ≤ D_i} ∪ {D_i}: at the
+    first point t with W(t) ≤ t, W(t) is the least fixed point. W is kept as
+    a running counter that grows by C_j whenever the walk passes a release of
+    task j, and the next release comes off a heap keyed by release time.
+    Returns the worst-case response time, or -1 if it exceeds the deadline D_i.
+    """
+    if C_i == 0:
+        # W(0) = 0 is already a fixed point.
+        return 0
+    n_hp = periods.shape[0]
+    # Every higher-priority task has one job released at time 0.
+    W = C_i
+    next_release = periods.copy()
+    heap = np.arange(n_hp)
+    for j in range(n_hp):
+        W += wcets[j]
+        _heap_sift_up(heap, j, next_release)
+    while True:
+        t = D_i
+        if n_hp > 0 and next_release[heap[0]] < D_i:
+            t = next_release[heap[0]]
+        if W <= t:
+            return W
+        if t == D_i:
+            return -1
+        # Past t, every task released at t adds one more job.
+        while next_release[heap[0]] == t:
+            j = heap[0]
+            W += wcets[j]
+            next_release[j] += periods[j]
+            _heap_sift_down(heap, n_hp, next_release)
+
+
+# Compile once at import so the JIT cost is not paid inside the first analysis.
+_rta_one(np.ones(1, dtype=np.int64), np.ones(1, dtype=np.int64), 1, 2)
 
 
 def response_time_analysis(tasks):
@@ -117,66 +286,97 @@ def response_time_analysis(tasks):
     The algorithm works as follows for each task τi (tasks are processed in order of decreasing priority,
     i.e., highest priority first):
 
-       1. Set R = C_i (WCET of task τi).
-       2. Repeat:
-            - Compute the interference from higher-priority tasks:
-                  I = Σ (ceil(R / T_j) * C_j) over all tasks j with higher priority.
-            - Set R = C_i + I.
-            - If R > D_i (deadline), the task is unschedulable.
-       3. Until R converges.
+       1. Walk the scheduling points t in increasing order: releases of higher-priority tasks up to D_i, and D_i.
+       2. Keep the workload up to t as a running sum, adding C_j at each release of task j:
+                  W(t) = C_i + Σ (ceil(t / T_j) * C_j) over all tasks j with higher priority.
+       3. The first t with W(t) <= t gives the response time R = W(t).
+          If there is none, R > D_i (deadline) and the task is unschedulable.
 
     Returns a dictionary mapping each task name to its computed worst-case response time.
     If a task is unschedulable, its value is set to None.
     """
-    # Sort tasks by Priority (lowest number indicates highest priority).
-    sorted_tasks = sorted(tasks, key=lambda x: x["Priority"])
+    # Sort tasks by Priority (lowest number indicates highest priority). The
+    # sorted periods and WCETs are sliced per task into the higher-priority
+    # prefix and handed to the compiled analysis.
+    order = np.argsort(tasks.priority, kind="stable")
+    periods = tasks.period[order]
+    wcets = tasks.wcet[order]
+    utilization = wcets / periods
+    # Cumulative utilization of each task and everything above it.
+    u_prefix = np.cumsum(utilization)
     response_times = {}
 
-    for i, task in enumerate(sorted_tasks):
-        C_i = task["WCET"]
-        D_i = task["Deadline"]
-        R_prev = 0
-        R = C_i  # Initial guess: the WCET of the task.
-
-        while R != R_prev:
-            R_prev = R
-            interference = 0
-            # Sum interference from all higher-priority tasks.
-            for j in range(i):
-                higher_task = sorted_tasks[j]
-                interference += (
-                    math.ceil(R / higher_task["Period"]) * higher_task["WCET"]
-                )
-            R = C_i + interference
-            # If the computed response time exceeds the deadline, mark as unschedulable.
-            if R > D_i:
-                R = None
-                break
-        response_times[task["Task"]] = R
+    for i, task_id in enumerate(order):
+        task_name = tasks.names[task_id]
+        D_i = tasks.deadline[task_id]
+        if u_prefix[i] > 1.0 + 1e-9 and wcets[i] > 0 and D_i <= periods[i]:
+            # Overloaded up to this priority level: the level-i busy period
+            # never ends, so the first job cannot finish by T_i >= D_i.
+            response_times[task_name] = None
+            continue
+        # Closed-form upper bound on the response time (Bini et al.):
+        #   R_i <= (C_i + Σ C_j (1 - U_j)) / (1 - Σ U_j) over higher-priority j.
+        # Points past it cannot hold the first fixed point, so the walk stops
+        # there (+1 absorbs rounding) when it comes before the deadline.
+        u_hp = u_prefix[i - 1] if i > 0 else 0.0
+        horizon = D_i
+        if u_hp < 1.0:
+            bound = (wcets[i] + (wcets[:i] * (1.0 - utilization[:i])).sum()) / (1.0 - u_hp)
+            horizon = min(D_i, int(bound) + 1)
+        R = _rta_one(periods[:i], wcets[:i], wcets[i], horizon)
+        # A negative result means the response time exceeded the deadline.
+        response_times[task_name] = int(R) if R >= 0 else None
 
     return response_times
 
 
+# Upper bound on the memory used for pre-drawn execution times at once;
+# simulate_multiple_runs() works through the runs in batches that fit.
+EXEC_TIMES_BATCH_BYTES = 64 * 1024 * 1024
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def _simulate_runs(wcet, period, priority, simulation_time, exec_times):
+    """
+    Run one _simulate() per slice exec_times[r] in parallel and return, per
+    task id, the maximum WCRT over all runs.
+    """
+    num_runs = exec_times.shape[0]
+    out = np.zeros((num_runs, period.shape[0]), dtype=np.int64)
+    for r in prange(num_runs):
+        out[r] = _simulate(wcet, period, priority, simulation_time, False, exec_times[r])
+    global_wcrt = np.zeros(period.shape[0], dtype=np.int64)
+    for r in range(num_runs):
+        for i in range(period.shape[0]):
+            global_wcrt[i] = max(global_wcrt[i], out[r, i])
+    return global_wcrt
+
+
 def simulate_multiple_runs(tasks, simulation_time, num_runs):
     """
     Runs the simulation for num_runs times and keeps an updated reference to each task's worst-case response time.
 
     For each simulation run, the worst-case response time (WCRT) for each task is computed.
     Across all runs, the global WCRT for a task is the maximum WCRT observed.
+    The execution times of all jobs are drawn up front from one generator
+    seeded by the `random` module, and the runs are spread over all cores.
 
     Returns:
         A dictionary mapping each task name to the maximum WCRT observed across all simulation runs.
     """
-    global_wcrt = {task["Task"]: 0 for task in tasks}
-
-    for _ in range(num_runs):
-        run_wcrt = simulate(tasks, simulation_time)
-        for task in tasks:
-            task_name = task["Task"]
-            if run_wcrt[task_name] > global_wcrt[task_name]:
-                global_wcrt[task_name] = run_wcrt[task_name]
-
-    return global_wcrt
+    rng = np.random.default_rng(random.getrandbits(128))
+    max_jobs = int((simulation_time // tasks.period).max()) + 1
+    batch = max(1, EXEC_TIMES_BATCH_BYTES // (8 * len(tasks) * max_jobs))
+    global_wcrt = np.zeros(len(tasks), dtype=np.int64)
+    for start in range(0, num_runs, batch):
+        exec_times = _draw_exec_times(
+            tasks, simulation_time, rng, min(batch, num_runs - start)
+        )
+        batch_wcrt = _simulate_runs(
+            tasks.wcet, tasks.period, tasks.priority, simulation_time, exec_times
+        )
+        np.maximum(global_wcrt, batch_wcrt, out=global_wcrt)
+    return dict(zip(tasks.names, global_wcrt.tolist()))
 
 
 def main():
@@ -216,15 +416,14 @@ def main():
     )
     print(header)
     print("-" * len(header))
-    for t in tasks:
-        task_name = t["Task"]
+    for i, task_name in enumerate(tasks.names):
         vss_val = vss_random[task_name]
         forced_val = vss_forced[task_name]
         rta_val = rta_results[task_name]
 
         # Mark forced simulation as unschedulable if its WCRT exceeds the task's deadline.
         forced_str = f"{forced_val}"
-        if forced_val > t["Deadline"]:
+        if forced_val > tasks.deadline[i]:
             forced_str += " (UNSCHEDULABLE)"
         # Mark RTA as unschedulable if its value is None.
         rta_str = f"{rta_val}" if rta_val is not None else "UNSCHEDULABLE"
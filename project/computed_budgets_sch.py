@@ -1,23 +1,12 @@
+from functools import lru_cache
 from math import floor, lcm
 from typing import List, Tuple
+import numpy as np
 from parser import parse_task, parse_budget, parse_cores
+from system import build_system
 from models.tasks import Task
 from models.components import Component
 
-# Builds our system 
-def build_system(tasks, budgets, cores):
-    for budget in budgets:
-        for task in tasks:
-            if task.component_id == budget.component_id:
-                budget.tasks.append(task)
-    
-    for core in cores:
-        for budget in budgets:
-            if budget.core_id == core.core_id:
-                core.components.append(budget) 
-
-    return cores
-
 # ------------------------------------------------------------
 # 1) Demand-Bound Functions (EDF & FPS), with WCET scaling
 # ------------------------------------------------------------
@@ -41,6 +30,23 @@ def dbf_fps(tasks: List[Task], t: float, target: Task, speed: float) -> float:
                 demand += count * (τ.wcet / speed)
     return demand
 
+def dbf_curve(tasks: List[Task], pts: np.ndarray, scheduler: str,
+              speed: float) -> np.ndarray:
+    """
+    Component demand at every point in pts at once: dbf_edf for EDF, and
+    for RM the max over target tasks of dbf_fps.
+    """
+    periods = np.array([tau.period for tau in tasks], dtype=np.float64)
+    wcets = np.array([tau.wcet / speed for tau in tasks], dtype=np.float64)
+    # jobs[k, j] = demand of task j's jobs with deadline ≤ pts[k]
+    jobs = np.floor(pts[:, None] / periods[None, :]) * wcets[None, :]
+    if scheduler == 'EDF':
+        return jobs.sum(axis=1)
+    prio = np.array([tau.priority for tau in tasks], dtype=np.int64)
+    # hp[i, j]: task j has RM-priority ≤ target task i's
+    hp = prio[None, :] <= prio[:, None]
+    return (jobs @ hp.T).max(axis=1)
+
 # ------------------------------------------------------------
 # 2) BDR Supply-Bound Function
 # ------------------------------------------------------------
@@ -51,17 +57,39 @@ def sbf_bdr(alpha: float, delta: float, t: float) -> float:
 # ------------------------------------------------------------
 # 3) Scheduling Points (Periods & Deadlines)
 # ------------------------------------------------------------
-def scheduling_points(servers: List) -> List[float]:
+def _hyperperiod(periods, cap: int = None) -> int:
+    """
+    lcm of the integer periods, or cap if the lcm would exceed it. Stops as
+    soon as the running lcm passes cap, so co-prime periods cannot blow up.
     """
-    Collect critical points (multiples of P and D) up to hyperperiod.
+    H = 1
+    for T in periods:
+        H = lcm(H, int(T))
+        if cap is not None and H >= cap:
+            return cap
+    return H
+
+@lru_cache(maxsize=None)
+def _sched_points(periods: Tuple[int, ...], cap: int = None) -> Tuple[int, ...]:
+    """
+    All multiples of the given (sorted, integer) periods up to their
+    hyperperiod, or up to cap if that comes first. Cached, since the same
+    period sets recur across analyses.
+    """
+    H = _hyperperiod(periods, cap)
+    return tuple(sorted({k * T for T in periods for k in range(1, H // T + 1)}))
+
+def scheduling_points(servers: List, cap: int = None) -> List[float]:
+    """
+    Collect critical points (multiples of P and D) up to hyperperiod,
+    or up to cap if that comes first.
     Each server has .period and .deadline.
     """
-    periods = [srv.period for srv in servers]
-    H = lcm(*map(int, periods))
-    pts = set()
+    periods = [int(srv.period) for srv in servers]
+    H = _hyperperiod(periods, cap)
+    pts = set(_sched_points(tuple(sorted(set(periods))), cap))
     for srv in servers:
         for k in range(1, int(H // srv.period) + 1):
-            pts.add(k * srv.period)
             pts.add(k * srv.deadline)
     return sorted(pts)
 
@@ -70,18 +98,12 @@ def scheduling_points(servers: List) -> List[float]:
 # ------------------------------------------------------------
 def compute_bdr_interface(comp: Component,
                           speed: float,
-                          alpha_step: float = 0.001,
-                          delta_step: float = 0.1
+                          alpha_step: float = 0.001
                          ) -> Tuple[float,float]:
     """
     Find minimal (α, Δ) s.t. ∀t: dbf ≤ sbf_bdr, using tasks in comp,
     with WCET scaled by core speed.
     """
-    # time points: multiples of task periods
-    task_periods = [tau.period for tau in comp.tasks]
-    H = lcm(*map(int, task_periods))
-    pts = sorted({k * T for T in task_periods for k in range(1, int(H // T) + 1)})
-
     # lower bound on α = total utilization (scaled WCET/period)
     U = sum((tau.wcet / speed) / tau.period for tau in comp.tasks)
     # HE is not overutilized
@@ -89,35 +111,59 @@ def compute_bdr_interface(comp: Component,
     # if U > 1.0:
     #     raise RuntimeError(f"Component {comp.component_id} is over‐utilized (U={U:.3f}>1). No BDR interface possible.")
 
-    best = None
+    # α grid: U, U + step, ... ≤ 1, accumulated step by step as a linear
+    # scan would. Feasibility is monotone in α (sbf_bdr grows with α while
+    # Δ = P - αP shrinks), so binary-search the grid for its first feasible point.
+    alphas = []
     alpha = U
     while alpha <= 1.0:
-        max_pt = lcm(*map(int, task_periods))   # allow Δ up to the hyperperiod
-        Q = alpha * comp.period
-        delta_min = comp.period - Q
-        delta = max(0.0, delta_min)
-        #delta = 0.0 creates a no delay system
-        while delta <= max_pt:
-            ok = True
-            for t in pts:
-                if comp.scheduler == 'EDF':
-                    demand = dbf_edf(comp.tasks, t, speed)
-                else:
-                    demand = max(dbf_fps(comp.tasks, t, tau, speed) for tau in comp.tasks)
-                supply = sbf_bdr(alpha, delta, t)
-                if demand > supply:
-                    ok = False
-                    break
-            if ok:
-                best = (round(alpha,3), round(delta,3))
-                break
-            delta += delta_step
-        if best:
-            break
+        alphas.append(alpha)
         alpha += alpha_step
-    if not best:
+    n = len(alphas) - 1
+
+    # Both dbf variants are bounded by U·t. For α > U, U·t ≤ α(t - Δ) once
+    # t ≥ αΔ/(α - U), so no later point can fail; that bound shrinks as α
+    # grows, so the one for the second grid point covers the whole search.
+    # For 0 < U < 1 the first grid point α = U is infeasible (at the
+    # hyperperiod dbf = U·H, which needs Δ = 0), so it is skipped instead of
+    # checked. U = 0 demands nothing, so α = U stays in the search.
+    lo, cap = 0, None
+    if 0.0 < U < 1.0 and n >= 1:
+        a1 = alphas[1]
+        d1 = max(0.0, comp.period - a1 * comp.period)
+        lo, cap = 1, floor(a1 * d1 / (a1 - U)) + 1
+
+    # time points: multiples of task periods, up to the hyperperiod or cap
+    task_periods = tuple(sorted({int(tau.period) for tau in comp.tasks}))
+    pts = np.asarray(_sched_points(task_periods, cap), dtype=np.float64)
+    # demand depends only on the tasks, not on (α, Δ): evaluate it once
+    demand = dbf_curve(comp.tasks, pts, comp.scheduler, speed)
+
+    # Only points with positive demand constrain Δ: there,
+    # α·(t - Δ) ≥ dbf(t) ⇔ Δ ≤ t - dbf(t)/α.
+    pos = demand > 0
+    pts_pos, demand_pos = pts[pos], demand[pos]
+
+    def min_delta(alpha: float):
+        """Smallest admissible Δ = P - αP if it is feasible for α, else None."""
+        # Largest Δ that keeps sbf_bdr above dbf at every point (BDR
+        # supply-bound derivation). Feasibility is monotone in Δ, so the
+        # smallest admissible Δ works iff it does not exceed Δ*.
+        delta_star = (pts_pos - demand_pos / alpha).min() if pos.any() else float('inf')
+        delta = max(0.0, comp.period - alpha * comp.period)
+        return delta if delta <= delta_star else None
+
+    if n < 0 or min_delta(alphas[n]) is None:
         raise RuntimeError(f"No feasible BDR interface for component {comp.component_id}")
-    return best
+    hi = n
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if min_delta(alphas[mid]) is None:
+            lo = mid + 1
+        else:
+            hi = mid
+    alpha = alphas[hi]
+    return (round(alpha,3), round(min_delta(alpha),3))
 
 # ------------------------------------------------------------
 # 5) Half-Half Transform → server task (Q, P, D)
@@ -146,21 +192,27 @@ def is_schedulable_core(servers: List[Tuple[float,float,float]],
             self.deadline = D
     srvs = [Srv(Q,P,D) for Q,P,D in servers]
 
-    pts = scheduling_points(srvs)
-    for t in pts:
-        if scheduler == 'EDF':
-            demand = sum(floor(t/s.period) * s.wcet for s in srvs)
-            if demand > t:
-                return False
-        else:
-            # RM: check at each priority level
-            sorted_srvs = sorted(srvs, key=lambda s: s.period)
-            for i in range(len(sorted_srvs)):
-                sub = sorted_srvs[:i+1]
-                d_i = sum(floor(t/sj.period) * sj.wcet for sj in sub)
-                if d_i > t:
-                    return False
-    return True
+    # ⌊t/P⌋Q ≤ t·Q/P, so with U = ∑Q/P ≤ 1 no point can fail. With U > 1,
+    # demand ≥ U·t - ∑Q > t for every t > ∑Q/(U - 1), and the first point past
+    # that bound comes within one period; the hyperperiod may be far beyond.
+    U = sum(s.wcet / s.period for s in srvs)
+    if U <= 1.0:
+        cap = 0
+    else:
+        cap = floor(sum(s.wcet for s in srvs) / (U - 1.0)) + 1 + int(max(s.period for s in srvs))
+    pts = np.asarray(scheduling_points(srvs, cap), dtype=np.float64)
+    if scheduler != 'EDF':
+        # RM: servers in priority (period) order, checked at each level
+        srvs = sorted(srvs, key=lambda s: s.period)
+    periods = np.array([s.period for s in srvs], dtype=np.float64)
+    wcets = np.array([s.wcet for s in srvs], dtype=np.float64)
+    # demand[k, i] = ⌊t_k/P_i⌋·Q_i for every point and server at once
+    demand = np.floor(pts[:, None] / periods[None, :]) * wcets[None, :]
+    if scheduler == 'EDF':
+        return not (demand.sum(axis=1) > pts).any()
+    # prefix[k, i]: demand of the i+1 highest-priority servers at t_k
+    prefix = demand.cumsum(axis=1)
+    return not (prefix > pts[:, None]).any()
 
 
 # ------------------------------------------------------------
@@ -187,12 +239,11 @@ def main():
     print("\n=== Core-Level Schedulability (BDR) ===")
     for core in cores:
         servers = []
-        for comp in budgets:
-            if comp.core_id == core.core_id:
-                Q, P, D = comp_servers[comp.component_id]
-                # scale supply by speed: Q/speed
-                #servers.append((Q / core.speed_factor, P, D)) # Might be double scaling
-                servers.append((Q, P, D))
+        for comp in core.components:
+            Q, P, D = comp_servers[comp.component_id]
+            # scale supply by speed: Q/speed
+            #servers.append((Q / core.speed_factor, P, D)) # Might be double scaling
+            servers.append((Q, P, D))
         ok = is_schedulable_core(servers, core.scheduler)
         print(f"Core {core.core_id} ({core.scheduler}): {'Schedulable' if ok else 'Not schedulable'}")
 
@@ -1,66 +1,120 @@
 from parser import parse_task, parse_budget, parse_cores
-from math import gcd
-from functools import reduce
-from math import floor
-
-# Builds our system 
-def build_system(tasks, budgets, cores):
-    for budget in budgets:
-        for task in tasks:
-            if task.component_id == budget.component_id:
-                budget.tasks.append(task)
-    
-    for core in cores:
-        for budget in budgets:
-            if budget.core_id == core.core_id:
-                core.components.append(budget) 
-
-    return cores
+from system import build_system
+from math import lcm
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
 # This is analysis code for the system
-def dbf(tasks, t, speed):
-    """EDF demand-bound for implicit‐deadline jobs."""
-    return sum(floor(t // task.period) * (task.wcet / speed) for task in tasks)
+def dbf(periods, wcets, pts, speed):
+    """EDF demand-bound for implicit‐deadline jobs, at every point in pts."""
+    return np.floor_divide(pts[:, None], periods[None, :]) @ (wcets / speed)
 
-def sbf(component, t):
-    """BDR supply bound with budget Q and period P."""
+def sbf(component, pts):
+    """BDR supply bound with budget Q and period P, at every point in pts."""
     Q, P = component.budget, component.period
     alpha = Q / P
     delta = P - Q
-    return max(0.0, alpha * (t - delta))
-
-def scheduling_points(component):
-    """
-    Return all t = k*P and t = k*D (D = P-Q) up to the hyperperiod.
+    return np.maximum(0.0, alpha * (pts - delta))
+
+def hyperperiod(component):
+    """lcm of the integer task periods, cached on the component."""
+    if component._hyperperiod is None:
+        periods = np.unique(component.task_periods.astype(np.int64))
+        if np.log2(periods).sum() < 63:
+            # the product bounds the lcm, so int64 cannot overflow
+            component._hyperperiod = int(np.lcm.reduce(periods, initial=1))
+        else:
+            component._hyperperiod = lcm(*(int(T) for T in periods))
+    return component._hyperperiod
+
+def scheduling_points(component, limit=None):
     """
-    P = int(component.period)
-    Q = component.budget
-    D = P - Q
+    Return all multiples of the task periods up to the hyperperiod, cached on
+    the component. With a limit below the hyperperiod, return only those up
+    to limit, uncached.
 
-    # compute hyperperiod over the sub‐task periods
-    periods = [int(t.period) for t in component.tasks]
-    hyper = reduce(lambda a, b: a * b // gcd(a, b), periods, 1)
-    pts = set()
-    for k in range(1, hyper // P + 1):
-        pts.add(k * P)
+    dbf is a step function that only jumps at these points, and sbf is
+    non-decreasing, so between two steps the supply can only catch up with
+    the demand: checking dbf <= sbf at the steps is enough.
+    """
+    periods = np.unique(component.task_periods.astype(np.int64))
+    if limit is not None and limit < hyperperiod(component):
+        arrs = [np.arange(T, limit + 1, T, dtype=np.int64) for T in periods]
+        return np.unique(np.concatenate(arrs))
+    if component._np_points is None:
+        hyper = hyperperiod(component)
+        arrs = [np.arange(T, hyper + 1, T, dtype=np.int64) for T in periods]
+        # np.unique both deduplicates and sorts
+        component._np_points = np.unique(np.concatenate(arrs))
+    return component._np_points
 
-    if D > 0:
-        n = int(hyper // D)
-        for k in range(1, n + 1):
-            pts.add(k * D)
-    return sorted(pts)
 
+# Points per block when only a yes/no verdict is needed
+MISS_SCAN_BLOCK = 4096
 
 # Cheks if component is schedulable
-def is_component_schedulable(comp, speed):
-    pts = scheduling_points(comp)
-    for t in pts:
-        # Computing if the tasks demand for CPU is less than the supply bound. If the demand is greater than the supply, then the system is not schedulable.
-        if dbf(comp.tasks, t, speed) > sbf(comp, t):
-            return False, t
+def is_component_schedulable(comp, speed, find_earliest_miss=True):
+    """
+    Return (ok, t): t is the earliest scheduling point where demand
+    exceeds supply, or None if the component is schedulable. With
+    find_earliest_miss=False, t is always None.
+    """
+    Q, P = comp.budget, comp.period
+    alpha = Q / P
+    periods, wcets = comp.task_periods, comp.task_wcets
+    U = float((wcets / periods).sum()) / speed
+    if U == 0:
+        return True, None
+    limit = None
+    if U > alpha + 1e-9:
+        if not find_earliest_miss:
+            return False, None
+        # Necessary condition: dbf(t) >= U*t - sum(C) and sbf(t) <= alpha*t,
+        # so demand exceeds supply past t* = sum(C)/(U-alpha). The first
+        # miss is at or before the first task-period multiple beyond t*.
+        t_star = float(wcets.sum()) / speed / (U - alpha)
+        limit = int(((np.floor(t_star / periods) + 1) * periods).min())
+    # Sufficient condition, for U < alpha: dbf(t) <= U*t everywhere and
+    # dbf(t) = 0 before the shortest period, while U*t <= sbf(t) from
+    # t = alpha*Delta/(alpha-U).
+    elif U < alpha and periods.min() >= alpha * (P - Q) / (alpha - U):
+        return True, None
+
+    pts = scheduling_points(comp, limit)
+    if not find_earliest_miss:
+        # any witness will do, and misses tend to show up late, so test the
+        # points largest-first, a block at a time
+        for end in range(len(pts), 0, -MISS_SCAN_BLOCK):
+            block = pts[max(0, end - MISS_SCAN_BLOCK):end]
+            if (dbf(periods, wcets, block, speed) > sbf(comp, block)).any():
+                return False, None
+        return True, None
+    # Computing if the tasks demand for CPU is less than the supply bound. If the demand is greater than the supply, then the system is not schedulable.
+    miss = dbf(periods, wcets, pts, speed) > sbf(comp, pts)
+    if miss.any():
+        return False, pts[miss.argmax()]
     return True, None
 
 
+def analyze_component(args):
+    """
+    Fixed-budget analysis of one component, as a top-level function so it
+    can run in a worker process. args is (core_id, comp, speed).
+    """
+    core_id, comp, speed = args
+    Q     = comp.budget
+    P     = comp.period
+    alpha = Q / P
+    delta = P - Q
+
+    # check schedulability; most components pass, so settle the verdict
+    # first and only look for the earliest miss when there is one
+    ok, miss_t = is_component_schedulable(comp, speed, find_earliest_miss=False)
+    if not ok:
+        ok, miss_t = is_component_schedulable(comp, speed)
+    return core_id, comp.component_id, alpha, delta, Q, P, ok, miss_t
+
+
 def main():
     tasks = parse_task()
     budgets = parse_budget()
@@ -71,20 +125,21 @@ def main():
     print("Fixed Budget Scheduling Analysis")
     print("===================================")
 
+    # components are independent, so analyse them in parallel; map keeps
+    # the results in worklist order
+    worklist = [(core.core_id, comp, core.speed_factor)
+                for core in system for comp in core.components]
+    with ProcessPoolExecutor() as pool:
+        results = iter(pool.map(analyze_component, worklist, chunksize=8))
+
     for core in system:
         print(f"-- Core {core.core_id} --")
-        for comp in core.components:
-            Q     = comp.budget
-            P     = comp.period
-            alpha = Q / P                
-            delta = P - Q               
-
-            # check schedulability
-            ok, miss_t = is_component_schedulable(comp, core.speed_factor)
+        for _ in core.components:
+            _, comp_id, alpha, delta, Q, P, ok, miss_t = next(results)
             status = "Schedulable" if ok else f"Miss at t={miss_t}"
 
             # print full stats
-            print(f" {comp.component_id}: "
+            print(f" {comp_id}: "
                   f"alpha={alpha:.3f}, Delta={delta:.3f}, "
                   f"Q={Q}, P={P} -> {status}")
         print()
@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from typing import List, Optional
+import numpy as np
 from .tasks import Task
 
 @dataclass(eq=True)
@@ -11,7 +12,31 @@ class Component:
     core_id: str
     priority: Optional[int]
     tasks: List[Task] = field(default_factory=list)
+    # Structure-of-arrays view of tasks (priority -1 where unset), filled by
+    # load_task_arrays() once tasks is complete.
+    task_names: List[str] = field(default_factory=list, repr=False, compare=False)
+    task_wcets: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False, compare=False)
+    task_periods: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False, compare=False)
+    task_priorities: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64), repr=False, compare=False)
+    # Analysis caches derived from the task arrays, filled lazily.
+    _np_points: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    _hyperperiod: Optional[int] = field(default=None, repr=False, compare=False)
 
     def __hash__(self):
         # only the ID matters for hashing
         return hash(self.component_id)
+
+    def load_task_arrays(self):
+        """Rebuild the task arrays from tasks and drop the derived caches."""
+        n = len(self.tasks)
+        self.task_names = [t.task_name for t in self.tasks]
+        self.task_wcets = np.fromiter((t.wcet for t in self.tasks), dtype=np.float64, count=n)
+        self.task_periods = np.fromiter((t.period for t in self.tasks), dtype=np.float64, count=n)
+        self.task_priorities = np.fromiter(
+            (-1 if t.priority is None else t.priority for t in self.tasks),
+            dtype=np.int64, count=n)
+        self.clear_cache()
+
+    def clear_cache(self):
+        self._np_points = None
+        self._hyperperiod = None
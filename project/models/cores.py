@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from typing import List
+import numpy as np
 from .components import Component
 
 @dataclass
@@ -7,4 +8,21 @@ class Core:
     core_id: str
     speed_factor: float
     scheduler: str          # top-level scheduler (e.g. 'EDF')
-    components: List[Component] = field(default_factory=list)
\ No newline at end of file
+    components: List[Component] = field(default_factory=list)
+    # Structure-of-arrays view of all tasks on the core, grouped by component:
+    # component c owns tasks comp_first[c]:comp_first[c+1]. WCETs are scaled
+    # by speed_factor. Filled by load_task_arrays() once components is complete.
+    comp_first: np.ndarray = field(default_factory=lambda: np.zeros(1, dtype=np.int64), repr=False, compare=False)
+    task_wcets: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False, compare=False)
+    task_periods: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False, compare=False)
+    task_priorities: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64), repr=False, compare=False)
+
+    def load_task_arrays(self):
+        """Rebuild the task arrays from the components' own task arrays."""
+        comps = self.components
+        self.comp_first = np.zeros(len(comps) + 1, dtype=np.int64)
+        self.comp_first[1:] = np.cumsum([len(c.tasks) for c in comps])
+        self.task_wcets = np.concatenate([np.empty(0)] + [c.task_wcets for c in comps]) / self.speed_factor
+        self.task_periods = np.concatenate([np.empty(0)] + [c.task_periods for c in comps])
+        self.task_priorities = np.concatenate(
+            [np.empty(0, dtype=np.int64)] + [c.task_priorities for c in comps])
@@ -19,49 +19,57 @@ ARCHITECTURE_FILE = "architecture.csv"
 BUDGET_FILE = "budgets.csv"
 
 
+def _read_columns(path):
+    """Read a CSV file into a dict mapping each header to its column."""
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        columns = list(zip(*reader)) or [()] * len(header)
+    return dict(zip(header, columns))
+
+
+def _optional_int(value):
+    return int(value) if value else None
+
+
 def parse_task():
-    tasks = []
-    with open(DIR + TASK_FILE) as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            tasks.append(Task(
-                task_name=row['task_name'],
-                wcet=float(row['wcet']),
-                period=float(row['period']),
-                component_id=row['component_id'],
-                priority=int(row['priority']) if row['priority'] else None,
-            ))
-    return tasks
+    cols = _read_columns(DIR + TASK_FILE)
+    return [
+        Task(task_name=name, wcet=wcet, period=period,
+             component_id=comp, priority=prio)
+        for name, wcet, period, comp, prio in zip(
+            cols['task_name'],
+            map(float, cols['wcet']),
+            map(float, cols['period']),
+            cols['component_id'],
+            map(_optional_int, cols['priority']),
+        )
+    ]
 
 
 def parse_budget():
-    budgets = []
-    with open(DIR + BUDGET_FILE) as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            budgets.append(Component(
-                component_id=row['component_id'],
-                scheduler=row['scheduler'],
-                budget=float(row['budget']),
-                period=float(row['period']),
-                core_id=row['core_id'],
-                priority=int(row['priority']) if row['priority'] else None,
-                tasks=[]
-            ))
-    return budgets
+    cols = _read_columns(DIR + BUDGET_FILE)
+    return [
+        Component(component_id=comp, scheduler=sched, budget=budget,
+                  period=period, core_id=core, priority=prio, tasks=[])
+        for comp, sched, budget, period, core, prio in zip(
+            cols['component_id'],
+            cols['scheduler'],
+            map(float, cols['budget']),
+            map(float, cols['period']),
+            cols['core_id'],
+            map(_optional_int, cols['priority']),
+        )
+    ]
 
 
 def parse_cores():
-    cores = []
-    with open(DIR + ARCHITECTURE_FILE) as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            cores.append(Core(
-                core_id=row['core_id'],
-                speed_factor=float(row['speed_factor']),
-                scheduler=row['scheduler'],
-                components=[]
-            ))
-    return cores
-
-
+    cols = _read_columns(DIR + ARCHITECTURE_FILE)
+    return [
+        Core(core_id=core, speed_factor=speed, scheduler=sched, components=[])
+        for core, speed, sched in zip(
+            cols['core_id'],
+            map(float, cols['speed_factor']),
+            cols['scheduler'],
+        )
+    ]
@@ -1,3 +1,4 @@
+import heapq
 import pandas as pd
 from dataclasses import dataclass, field
 from typing import List, Dict
@@ -80,69 +81,90 @@ def load_system():
     return list(cores.values())
 
 def simulate_core(core: Core, sim_time: int) -> Dict[str,int]:
-    # Initialize per-task WCRT and release times
+    # Initialize per-task WCRT
     wcrt = {task.task_name: 0 for comp in core.components for task in comp.tasks}
-    next_task_release = {task.task_name:0 for comp in core.components for task in comp.tasks}
     # Initialize component server budgets
     for comp in core.components:
         comp.remaining_budget = comp.budget
-    # Simple time-stepped simulation
-    jobs = []  # active jobs
-    for t in range(sim_time):
-        # Refill component budgets at server periods
-        for comp in core.components:
-            if t % comp.period == 0:
-                comp.remaining_budget = comp.budget
-        # Release task jobs
-        for comp in core.components:
-            for task in comp.tasks:
-                if t % task.period == 0:
-                    jobs.append({
-                        'task': task,
-                        'release': t,
-                        'remaining': task.wcet,
-                        'abs_deadline': t + task.deadline,
-                        'component': comp
-                    })
+    # Upcoming replenishments (kind 0) and releases (kind 1), in the order a
+    # tick-by-tick loop would handle them: replenishments first, then releases
+    # by component and task order
+    events = []
+    for i, comp in enumerate(core.components):
+        heapq.heappush(events, (0, 0, i, comp))
+    order = 0
+    for comp in core.components:
+        for task in comp.tasks:
+            heapq.heappush(events, (0, 1, order, (comp, task)))
+            order += 1
+    # Event-driven simulation: jump from one schedule-relevant time to the next
+    jobs = {}  # active jobs by job id, in release order
+    next_job_id = 0
+    t = 0
+    while t < sim_time:
+        # Refill component budgets and release task jobs due at t
+        while events and events[0][0] == t:
+            _, kind, key, obj = heapq.heappop(events)
+            if kind == 0:
+                obj.remaining_budget = obj.budget
+                heapq.heappush(events, (t + obj.period, 0, key, obj))
+            else:
+                comp, task = obj
+                jobs[next_job_id] = {
+                    'id': next_job_id,
+                    'task': task,
+                    'release': t,
+                    'remaining': task.wcet,
+                    'abs_deadline': t + task.deadline,
+                    'component': comp
+                }
+                next_job_id += 1
+                heapq.heappush(events, (t + task.period, 1, key, obj))
+        next_event = min(events[0][0], sim_time) if events else sim_time
         # Collect ready jobs that have budget
-        ready = [job for job in jobs
+        ready = [job for job in jobs.values()
                  if job['release'] <= t
                  and job['remaining'] > 0
                  and job['component'].remaining_budget > 0]
-        if ready:
-            # Core-level: select component server
-            # Group by component
-            # comps_ready = {job['component'] for job in ready}
-            # Build a map from component_id → Component
-            comps_map = {job['component'].component_id: job['component'] for job in ready}
-            # Then take its values() to get a unique list of Component
-            comps_ready = list(comps_map.values())
-            
-            # Choose component by core scheduler
-            if core.scheduler == 'RM':
-                # lowest priority number first
-                sel_comp = min(comps_ready, key=lambda c: c.priority)
-            else:  # EDF at core: choose earliest next deadline (server period)
-                sel_comp = min(
-                    comps_ready,
-                    key=lambda c: ((t//c.period + 1)*c.period)
-                )
-            # Within that component, pick job by comp.scheduler
-            comp_jobs = [job for job in ready if job['component']==sel_comp]
-            if sel_comp.scheduler == 'RM':
-                sel_job = min(comp_jobs, key=lambda j: j['task'].priority)
-            else:  # EDF within component
-                sel_job = min(comp_jobs, key=lambda j: j['abs_deadline'])
-            # Run 1 time unit
-            sel_job['remaining'] -= 1
-            sel_comp.remaining_budget -= 1
-            # If job finishes, record WCRT
-            if sel_job['remaining'] == 0:
-                rt = (t+1) - sel_job['release']
-                name = sel_job['task'].task_name
-                wcrt[name] = max(wcrt[name], rt)
-                jobs.remove(sel_job)
-        # else idle for this core
+        if not ready:
+            # idle until the next release or replenishment
+            t = next_event
+            continue
+        # Core-level: select component server
+        # Group by component
+        # comps_ready = {job['component'] for job in ready}
+        # Build a map from component_id → Component
+        comps_map = {job['component'].component_id: job['component'] for job in ready}
+        # Then take its values() to get a unique list of Component
+        comps_ready = list(comps_map.values())
+        
+        # Choose component by core scheduler
+        if core.scheduler == 'RM':
+            # lowest priority number first
+            sel_comp = min(comps_ready, key=lambda c: c.priority)
+        else:  # EDF at core: choose earliest next deadline (server period)
+            sel_comp = min(
+                comps_ready,
+                key=lambda c: ((t//c.period + 1)*c.period)
+            )
+        # Within that component, pick job by comp.scheduler
+        comp_jobs = [job for job in ready if job['component']==sel_comp]
+        if sel_comp.scheduler == 'RM':
+            sel_job = min(comp_jobs, key=lambda j: j['task'].priority)
+        else:  # EDF within component
+            sel_job = min(comp_jobs, key=lambda j: j['abs_deadline'])
+        # The choice holds until the job finishes, the budget runs out or the
+        # next event; the EDF server deadlines only move at replenishments
+        dt = min(sel_job['remaining'], sel_comp.remaining_budget, next_event - t)
+        sel_job['remaining'] -= dt
+        sel_comp.remaining_budget -= dt
+        t += dt
+        # If job finishes, record WCRT
+        if sel_job['remaining'] == 0:
+            rt = t - sel_job['release']
+            name = sel_job['task'].task_name
+            wcrt[name] = max(wcrt[name], rt)
+            del jobs[sel_job['id']]
     return wcrt
 
 # Example usage:
@@ -1,126 +1,321 @@
 import csv
 import heapq
-import statistics
-from math import lcm
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from math import ceil, floor, lcm
+import numpy as np
 from parser import parse_task, parse_budget, parse_cores
+from system import build_system
 from models.cores import Core
 from computed_budgets_sch import compute_bdr_interface, half_half_server, is_schedulable_core
-
-# A tiny event type for our discrete‐event sim
-class Event:
-    __slots__ = ("time","kind","obj")
-    def __init__(self, time: float, kind: str, obj):
-        self.time = time
-        self.kind = kind    # "release" or "replenish"
-        self.obj = obj
-    def __lt__(self, other): 
-        return self.time < other.time
-
-def build_system(tasks, budgets, cores):
-    # attach tasks → components
-    for comp in budgets:
-        comp.tasks = [t for t in tasks if t.component_id == comp.component_id]
-        comp.budget_left = comp.budget
-        comp.next_replenish = comp.period
-    # attach components → cores
-    for core in cores:
-        core.components = [c for c in budgets if c.core_id == core.core_id]
-        core.current_time = 0.0
-    return cores
-
-def simulate_core(core: Core, horizon: float):
-    """ Run until `horizon`, return dict task_name→{avg_rt,max_rt,missed}. """
+from simulator_nb import HAVE_NUMBA, run_core
+
+# Events for our discrete‐event sim are plain (time, kind, seq, obj) tuples,
+# so heapq compares them in C; seq is a unique tiebreaker that keeps obj
+# from ever being compared
+REPLENISH, RELEASE = 0, 1
+
+# The simulator runs on an integer clock of TIME_SCALE ticks per time unit,
+# so that finish and exhaustion checks are exact
+TIME_SCALE = 1000
+
+def to_ticks(x, round_up=True):
+    """
+    x time units as whole ticks: rounded up for demand (execution times,
+    periods) and down for supply (budgets), so the simulation never gets
+    more service than the float model. The slack absorbs float noise.
+    """
+    x *= TIME_SCALE
+    return ceil(x - 1e-6) if round_up else floor(x + 1e-6)
+
+def to_ticks_array(x, round_up=True):
+    """to_ticks over a float array, as an int64 array."""
+    x = x * TIME_SCALE
+    return (np.ceil(x - 1e-6) if round_up else np.floor(x + 1e-6)).astype(np.int64)
+
+def _top_task(comp):
+    """
+    First runnable task in comp.ready_heap, or None. Entries are
+    (key, index, task); ones left behind by finished jobs or by an EDF
+    deadline change are dropped on the way.
+    """
+    heap = comp.ready_heap
+    while heap:
+        key, _, t = heap[0]
+        if t.remaining > 0 and key == (t.deadline if comp.is_edf else t.priority):
+            return t
+        heapq.heappop(heap)
+    return None
+
+def _min_deadline(comp):
+    """
+    Earliest deadline among comp's unfinished tasks, from comp.deadline_heap
+    (the same list as ready_heap for an EDF component).
+    """
+    heap = comp.deadline_heap
+    while heap:
+        deadline, _, t = heap[0]
+        if t.remaining > 0 and deadline == t.deadline:
+            return deadline
+        heapq.heappop(heap)
+    return None
+
+def _compact_deadlines(comp):
+    """
+    Rebuild comp.deadline_heap in place from its live entries, once stale
+    ones (finished or re-released jobs) outnumber the pending jobs, so a
+    task re-released behind the top cannot grow the heap without bound.
+    """
+    heap = comp.deadline_heap
+    if len(heap) > 2 * comp.pending_count + 8:
+        heap[:] = [e for e in heap if e[2].remaining > 0 and e[0] == e[2].deadline]
+        heapq.heapify(heap)
+
+def _push_comp(comp_heap, c):
+    """Queue c on an EDF core's ready heap if it has work and budget left."""
+    if c.budget_left > 0 and c.pending_count > 0:
+        key = _min_deadline(c)
+        # an entry under this key may still be in the heap
+        if key != c.queued_key:
+            heapq.heappush(comp_heap, (key, c.index, c))
+            c.queued_key = key
+
+def _top_comp(comp_heap):
+    """First component with work and budget on an EDF core's ready heap, or None."""
+    while comp_heap:
+        key, _, c = comp_heap[0]
+        if c.budget_left > 0 and c.pending_count > 0 and key == _min_deadline(c):
+            return c
+        heapq.heappop(comp_heap)
+        if key == c.queued_key:
+            c.queued_key = None
+    return None
+
+def _run_core_py(core: Core, horizon: int):
+    """
+    Event loop behind simulate_core, in ticks up to `horizon`, keeping each
+    task's response time sum, max and count (in ticks).
+    """
     # event queue
     evq = []
+    seq = count()
     for comp in core.components:
-        heapq.heappush(evq, Event(0.0, "replenish", comp))
+        comp.budget_ticks = to_ticks(comp.budget, round_up=False)
+        comp.period_ticks = to_ticks(comp.period)
+        comp.budget_left = comp.budget_ticks
+        heapq.heappush(evq, (0, REPLENISH, next(seq), comp))
         for t in comp.tasks:
-            t.next_release = 0.0
-            t.remaining    = 0.0
-            t.response_times = []
-            heapq.heappush(evq, Event(0.0, "release", t))
-
-    ready_comps = set()
-    while evq and core.current_time < horizon:
-        ev = heapq.heappop(evq)
-        core.current_time = ev.time
-
-        if ev.kind == "replenish":
-            c = ev.obj
-            c.budget_left = c.budget
-            c.next_replenish = core.current_time + c.period
-            heapq.heappush(evq, Event(c.next_replenish, "replenish", c))
+            t.period_ticks = to_ticks(t.period)
+            t.exec_ticks   = to_ticks(t.scaled_wcet)
+            t.next_release = 0
+            t.remaining    = 0
+            t.rt_sum = t.rt_max = t.rt_count = 0
+            heapq.heappush(evq, (0, RELEASE, next(seq), t))
+        # released, unfinished tasks as a heap keyed by deadline (EDF) or
+        # priority (RM), ties going to the task listed first
+        comp.ready_heap = []
+        comp.deadline_heap = comp.ready_heap if comp.is_edf else []
+        comp.pending_count = 0
+        comp.queued_key = None
+
+    # Core-level order, ties going to the component listed first: RM is
+    # static, so a pre-sorted list with a bitmask of the components that
+    # have work and budget (bit k for the k-th in priority order, so the
+    # lowest set bit is the pick); EDF follows each component's earliest
+    # pending deadline, so a heap
+    core_is_edf = core.is_edf
+    if core_is_edf:
+        comp_heap = []
+    else:
+        core.components_rm = sorted(core.components, key=lambda c: (c.priority, c.index))
+        for k, c in enumerate(core.components_rm):
+            c.rm_bit = 1 << k
+    ready_mask = 0
+    # the loop state lives in locals and core.current_time is written once
+    # at the end: local lookups are much cheaper than attribute ones
+    heappush, heappop = heapq.heappush, heapq.heappop
+    components_rm = None if core_is_edf else core.components_rm
+    now = 0
+    while evq and now < horizon:
+        now, kind, _, obj = heappop(evq)
+
+        if kind == REPLENISH:
+            c = obj
+            c.budget_left = c.budget_ticks
+            c.next_replenish = now + c.period_ticks
+            heappush(evq, (c.next_replenish, REPLENISH, next(seq), c))
             # if any jobs still pending in c, make it ready
-            if any(t.remaining>0 for t in c.tasks):
-                ready_comps.add(c)
+            if core_is_edf:
+                _push_comp(comp_heap, c)
+            elif c.budget_left > 0 and c.pending_count > 0:
+                ready_mask |= c.rm_bit
         else:  # release
-            job = ev.obj
-            job.remaining    = job.wcet / core.speed_factor
-            job.release_time = core.current_time
-            job.deadline     = core.current_time + job.period
-            job.next_release += job.period
-            heapq.heappush(evq, Event(job.next_release, "release", job))
-            parent = next(c for c in core.components if c.component_id==job.component_id)
-            ready_comps.add(parent)
-
-        # pick nothing if no work
-        if not ready_comps:
-            continue
-
-        # only keep components that still have work + budget
-        active = [c for c in ready_comps if c.budget_left>0 and any(t.remaining>0 for t in c.tasks)]
-        if not active:
+            job = obj
+            was_pending = job.remaining > 0
+            rem = job.remaining = job.exec_ticks
+            job.release_time = now
+            deadline = job.deadline = now + job.period_ticks
+            job.next_release += job.period_ticks
+            heappush(evq, (job.next_release, RELEASE, next(seq), job))
+            parent = job.parent
+            if rem > 0:
+                # a deadline entry goes stale with the old deadline, an RM
+                # priority entry stays valid across a re-release; only an
+                # EDF core reads an RM component's deadlines
+                if parent.is_edf or core_is_edf:
+                    heappush(parent.deadline_heap, (deadline, job.index, job))
+                if not parent.is_edf and not was_pending:
+                    heappush(parent.ready_heap, (job.priority, job.index, job))
+                if not was_pending:
+                    parent.pending_count += 1
+                _compact_deadlines(parent)
+            elif was_pending:
+                parent.pending_count -= 1
+            if core_is_edf:
+                _push_comp(comp_heap, parent)
+            elif parent.budget_left > 0 and parent.pending_count > 0:
+                ready_mask |= parent.rm_bit
+            else:
+                ready_mask &= ~parent.rm_bit
+
+        # core‐level pick; nothing to do if no component has work + budget
+        if core_is_edf:
+            comp = _top_comp(comp_heap)
+        elif ready_mask:
+            comp = components_rm[(ready_mask & -ready_mask).bit_length() - 1]
+        else:
+            comp = None
+        if comp is None:
             continue
 
-        # core‐level pick
-        if core.scheduler=="EDF":
-            comp = min(active, key=lambda c: min(t.deadline for t in c.tasks if t.remaining>0))
-        else:  # RM at core
-            comp = min(active, key=lambda c: c.priority)
-
         # task‐level pick
-        runnables = [t for t in comp.tasks if t.remaining>0]
-        if comp.scheduler=="EDF":
-            task = min(runnables, key=lambda t: t.deadline)
-        else:
-            task = min(runnables, key=lambda t: t.priority)
+        task = _top_task(comp)
 
-        next_evt = evq[0].time if evq else horizon
-        run_until = min(core.current_time + comp.budget_left,
-                        core.current_time + task.remaining,
-                        next_evt)
-        dt = run_until - core.current_time
+        # the event queue never empties: every event queues its successor
+        next_evt = evq[0][0]
+        bl, rem = comp.budget_left, task.remaining
+        dt = min(bl, rem, next_evt - now)
 
         # consume
-        comp.budget_left -= dt
-        task.remaining    -= dt
-        core.current_time  = run_until
+        comp.budget_left = bl - dt
+        rem = task.remaining = rem - dt
+        now += dt
 
         # finished job?
-        if task.remaining<=0:
-            rt = core.current_time - task.release_time
-            task.response_times.append(rt)
+        if rem<=0:
+            rt = now - task.release_time
+            task.rt_sum += rt
+            if rt > task.rt_max:
+                task.rt_max = rt
+            task.rt_count += 1
+            heappop(comp.ready_heap)
+            comp.pending_count -= 1
+            # its EDF key may have moved on
+            if core_is_edf:
+                _push_comp(comp_heap, comp)
+        if not core_is_edf and (comp.budget_left <= 0 or comp.pending_count <= 0):
+            ready_mask &= ~comp.rm_bit
+    core.current_time = now
+
+def _run_core_nb(core: Core, horizon: int):
+    """
+    Pack the core into tick arrays, run simulator_nb.run_core up to `horizon`
+    ticks and unpack each task's response time sum, max and count (in ticks).
+    """
+    comps = core.components
+    tasks = [t for c in comps for t in c.tasks]
+    rt_sum = np.zeros(len(tasks), dtype=np.int64)
+    rt_max = np.zeros(len(tasks), dtype=np.int64)
+    rt_count = np.zeros(len(tasks), dtype=np.int64)
+    if core.is_edf:
+        comp_order = np.arange(len(comps))
+    else:
+        comp_order = np.array(sorted(range(len(comps)), key=lambda c: (comps[c].priority, c)),
+                              dtype=np.int64)
+    core.current_time = run_core(
+        to_ticks_array(core.task_wcets),
+        to_ticks_array(core.task_periods),
+        core.task_priorities,
+        core.comp_first,
+        comp_order,
+        # budgets are read here, not in build_system: main_computed
+        # overrides them after the system is built
+        to_ticks_array(np.array([c.budget for c in comps], dtype=np.float64), round_up=False),
+        to_ticks_array(np.array([c.period for c in comps], dtype=np.float64)),
+        np.array([c.is_edf for c in comps]),
+        core.is_edf,
+        horizon,
+        rt_sum,
+        rt_max,
+        rt_count,
+    )
+    for i, t in enumerate(tasks):
+        t.rt_sum, t.rt_max, t.rt_count = int(rt_sum[i]), int(rt_max[i]), int(rt_count[i])
 
-        # update ready set
-        if comp.budget_left<=0:
-            ready_comps.discard(comp)
-        if task.remaining>0:
-            ready_comps.add(comp)
-
-    # aggregate metrics
+def simulate_core(core: Core, horizon: float):
+    """ Run until `horizon`, return dict task_name→{avg_rt,max_rt,missed}. """
+    horizon = to_ticks(horizon)
+    if HAVE_NUMBA:
+        _run_core_nb(core, horizon)
+    else:
+        _run_core_py(core, horizon)
+
+    # aggregate metrics from the running totals; a job missed its deadline
+    # iff the worst response time exceeds the period
     out = {}
     for c in core.components:
         sup_util = c.budget / c.period
         for t in c.tasks:
-            rts = t.response_times
+            max_rt = t.rt_max / TIME_SCALE
             out[t.task_name] = {
-                "avg_rt": statistics.mean(rts) if rts else 0.0,
-                "max_rt": max(rts) if rts else 0.0,
-                "missed": any(rt>t.period for rt in rts),
+                "avg_rt": t.rt_sum / (t.rt_count * TIME_SCALE) if t.rt_count else 0.0,
+                "max_rt": max_rt,
+                "missed": max_rt>t.period,
                 "sup_util": sup_util
             }
     return out
 
+def hyperperiod(tasks):
+    """lcm of the integer task periods, each distinct period taken once."""
+    return lcm(*{int(t.period) for t in tasks})
+
+def _simulate_core_args(args):
+    """simulate_core(*args), as a top-level function so it can run in a worker process."""
+    return simulate_core(*args)
+
+def simulate_cores(cores, horizon: float):
+    """
+    Simulate every core up to `horizon` and merge their results. Cores share
+    no state, so each one runs in its own worker process.
+    """
+    sim_results = {}
+    workers = min(len(cores), os.cpu_count() or 1) or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for res in pool.map(_simulate_core_args, [(core, horizon) for core in cores]):
+            sim_results.update(res)
+    return sim_results
+
+def write_results(path, tasks, sim_results, comp_sched):
+    """Write one CSV row per task, in task order, with a single writerows call."""
+    rows = (
+        (t.task_name,
+         t.component_id,
+         0 if m["missed"] else 1,
+         format(m["avg_rt"], ".3f"),
+         format(m["max_rt"], ".3f"),
+         format(m["sup_util"], ".3f"),
+         1 if comp_sched[t.component_id] else 0)
+        for t in tasks
+        for m in (sim_results[t.task_name],)
+    )
+    with open(path, "w", newline="", buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(["task_name", "component_id", "task_schedulable",
+                    "avg_response_time", "max_response_time",
+                    "sup_util", "component_schedulable"])
+        w.writerows(rows)
+
 def main():
 
     tasks   = parse_task()
@@ -128,13 +323,10 @@ def main():
     cores   = parse_cores()
     sim_sys = build_system(tasks, budgets, cores)
     
-    horizon=1
-    for t in tasks:
-        horizon = lcm(horizon, int(t.period))
+    # simulate one hyperperiod of all tasks
+    horizon = hyperperiod(tasks)
 
-    sim_results = {}
-    for core in sim_sys:
-        sim_results.update(simulate_core(core, horizon))
+    sim_results = simulate_cores(sim_sys, horizon)
 
     # 3) per‐component sched (all tasks must be non‐missed)
     comp_sched = {}
@@ -143,21 +335,7 @@ def main():
                                              for t in comp.tasks)
 
     # 4) write solution.csv
-    with open("large.csv","w",newline="") as f:
-        w=csv.writer(f)
-        w.writerow(["task_name","component_id","task_schedulable",
-                    "avg_response_time","max_response_time","sup_util","component_schedulable"])
-        for t in tasks:
-            m = sim_results[t.task_name]
-            w.writerow([
-                t.task_name,
-                t.component_id,
-                0 if m["missed"] else 1,
-                f"{m['avg_rt']:.3f}",
-                f"{m['max_rt']:.3f}",
-                f"{m['sup_util']:.3f}",
-                1 if comp_sched[t.component_id] else 0
-            ])
+    write_results("large.csv", tasks, sim_results, comp_sched)
 
     print("→ simulation done, wrote solution.csv")
 
@@ -193,10 +371,9 @@ def main2():
     print("=== Core-Level Schedulability (BDR) ===")
     for core in cores:
         servers = []
-        for comp in budgets:
-            if comp.core_id == core.core_id:
-                Q, P, D = comp_servers[comp.component_id]
-                servers.append((Q, P, D))
+        for comp in core.components:
+            Q, P, D = comp_servers[comp.component_id]
+            servers.append((Q, P, D))
         ok = is_schedulable_core(servers, core.scheduler)
         print(f"Core {core.core_id} ({core.scheduler}): {'Schedulable' if ok else 'Not schedulable'}")
 
@@ -219,13 +396,10 @@ def main_computed():
 
     # 2) Build and run the simulation exactly as before
     
-    horizon = 1
-    for t in tasks:
-        horizon = lcm(horizon, int(t.period))
+    # simulate one hyperperiod of all tasks
+    horizon = hyperperiod(tasks)
 
-    sim_results = {}
-    for core in sim_sys:
-        sim_results.update(simulate_core(core, horizon))
+    sim_results = simulate_cores(sim_sys, horizon)
 
     # 3) Collect per‐component schedulability
     comp_sched = {
@@ -235,24 +409,7 @@ def main_computed():
     }
 
     # 4) Write out results
-    with open("computed_solution.csv", "w", newline="") as f:
-        w = csv.writer(f)
-        w.writerow([
-            "task_name", "component_id", "task_schedulable",
-            "avg_response_time", "max_response_time",
-            "sup_util", "component_schedulable"
-        ])
-        for t in tasks:
-            m = sim_results[t.task_name]
-            w.writerow([
-                t.task_name,
-                t.component_id,
-                0 if m["missed"] else 1,
-                f"{m['avg_rt']:.3f}",
-                f"{m['max_rt']:.3f}",
-                f"{m['sup_util']:.3f}",
-                1 if comp_sched[t.component_id] else 0
-            ])
+    write_results("computed_solution.csv", tasks, sim_results, comp_sched)
 
     print("→ simulation with computed budgets done, wrote computed_solution.csv")
 
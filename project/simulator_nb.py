@@ -0,0 +1,178 @@
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # Numba is optional; simulator.py then runs its heap-based loop.
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    HAVE_NUMBA = False
+
+# Compiled event loop behind simulator.simulate_core. Everything is a flat
+# int64 array in ticks: tasks are grouped by component, so component c owns
+# tasks comp_first[c]:comp_first[c+1]. Event e < n_comps is the replenishment
+# of component e, and event n_comps + i the release of task i.
+
+
+@njit(cache=True)
+def _heap_sift_down(heap, size, key):
+    """Restore the min-heap order of heap[:size] after heap[0] was replaced."""
+    pos = 0
+    item = heap[0]
+    while True:
+        child = 2 * pos + 1
+        if child >= size:
+            break
+        right = child + 1
+        if right < size and (
+            key[heap[right]] < key[heap[child]]
+            or (key[heap[right]] == key[heap[child]] and heap[right] < heap[child])
+        ):
+            child = right
+        other = heap[child]
+        if key[other] < key[item] or (key[other] == key[item] and other < item):
+            heap[pos] = other
+            pos = child
+        else:
+            break
+    heap[pos] = item
+
+
+# Task-level scheduling of a core's components, as a kernel specialization
+TASKS_RM, TASKS_EDF, TASKS_MIXED = 0, 1, 2
+
+
+def _make_kernel(core_is_edf, task_sched):
+    """
+    Build the event loop for one (core scheduler, task scheduling) pair.
+    Numba compiles closure variables as constants, so each variant loses
+    the branches that do not apply to it.
+    """
+    @njit(cache=True)
+    def kernel(task_exec, task_period, task_prio, comp_first, comp_order,
+               comp_budget, comp_period, comp_is_edf, horizon,
+               rt_sum, rt_max, rt_count):
+        """
+        Simulate one core up to horizon ticks, specialized for core_is_edf
+        and task_sched.
+
+        task_exec is the WCET already scaled by the core speed. comp_order lists
+        the components by RM priority (in index order under EDF), so an RM core
+        takes the first one with work and budget; elsewhere the strict
+        comparisons give ties to the lowest index. Task i's response times are
+        summed into rt_sum[i], maxed into rt_max[i] and counted in rt_count[i].
+        Returns the time the run stopped at.
+        """
+        n_tasks = task_period.shape[0]
+        n_comps = comp_period.shape[0]
+        never = np.iinfo(np.int64).max
+        remaining = np.zeros(n_tasks, dtype=np.int64)
+        deadline = np.zeros(n_tasks, dtype=np.int64)
+        release_time = np.zeros(n_tasks, dtype=np.int64)
+        budget_left = comp_budget.copy()
+        if n_comps == 0:
+            return 0
+
+        # Every component and task has exactly one pending event, so the event
+        # heap keeps a fixed size: handling an event moves its time forward and
+        # sifts it down from the root. All events start at time 0.
+        n_events = n_comps + n_tasks
+        event_time = np.zeros(n_events, dtype=np.int64)
+        event_heap = np.arange(n_events)
+
+        current_time = 0
+        while current_time < horizon:
+            e = event_heap[0]
+            current_time = event_time[e]
+
+            if e < n_comps:  # replenish
+                c = e
+                budget_left[c] = comp_budget[c]
+                event_time[e] = current_time + comp_period[c]
+            else:  # release
+                i = e - n_comps
+                remaining[i] = task_exec[i]
+                release_time[i] = current_time
+                deadline[i] = current_time + task_period[i]
+                event_time[e] += task_period[i]
+            _heap_sift_down(event_heap, n_events, event_time)
+            next_evt = event_time[event_heap[0]]
+
+            # core‐level pick: a component with work + budget
+            comp = -1
+            best = 0
+            for c in comp_order:
+                if budget_left[c] <= 0:
+                    continue
+                key = never
+                for i in range(comp_first[c], comp_first[c + 1]):
+                    if remaining[i] > 0:
+                        key = min(key, deadline[i])
+                if key == never:
+                    continue
+                if not core_is_edf:
+                    comp = c
+                    break
+                if comp < 0 or key < best:
+                    comp = c
+                    best = key
+            if comp < 0:
+                continue
+
+            # task‐level pick
+            task = -1
+            for i in range(comp_first[comp], comp_first[comp + 1]):
+                if remaining[i] <= 0:
+                    continue
+                if task_sched == TASKS_EDF:
+                    key = deadline[i]
+                elif task_sched == TASKS_RM:
+                    key = task_prio[i]
+                else:
+                    key = deadline[i] if comp_is_edf[comp] else task_prio[i]
+                if task < 0 or key < best:
+                    task = i
+                    best = key
+
+            dt = min(budget_left[comp], remaining[task], next_evt - current_time)
+
+            # consume
+            budget_left[comp] -= dt
+            remaining[task] -= dt
+            current_time += dt
+
+            # finished job?
+            if remaining[task] <= 0:
+                rt = current_time - release_time[task]
+                rt_sum[task] += rt
+                if rt > rt_max[task]:
+                    rt_max[task] = rt
+                rt_count[task] += 1
+
+        return current_time
+
+    return kernel
+
+
+_KERNELS = {(core_is_edf, task_sched): _make_kernel(core_is_edf, task_sched)
+            for core_is_edf in (False, True)
+            for task_sched in (TASKS_RM, TASKS_EDF, TASKS_MIXED)}
+
+
+def run_core(task_exec, task_period, task_prio, comp_first, comp_order,
+             comp_budget, comp_period, comp_is_edf, core_is_edf, horizon,
+             rt_sum, rt_max, rt_count):
+    """Run the kernel variant for this core (see _make_kernel)."""
+    if comp_is_edf.all():
+        task_sched = TASKS_EDF
+    elif not comp_is_edf.any():
+        task_sched = TASKS_RM
+    else:
+        task_sched = TASKS_MIXED
+    return _KERNELS[bool(core_is_edf), task_sched](
+        task_exec, task_period, task_prio, comp_first, comp_order,
+        comp_budget, comp_period, comp_is_edf, horizon,
+        rt_sum, rt_max, rt_count)
@@ -0,0 +1,47 @@
+from collections import defaultdict
+from typing import List
+from models.tasks import Task
+from models.components import Component
+from models.cores import Core
+
+# Builds our system 
+def build_system(tasks: List[Task], budgets: List[Component],
+                 cores: List[Core]) -> List[Core]:
+    """
+    Attach tasks to their components and components to their cores, keeping
+    CSV order. Each task also gets .parent (its component) and .index (its
+    position there), each component .index (its position on the core) and
+    its task arrays, and components and cores an .is_edf flag so the
+    simulator never compares scheduler strings. Each task's .scaled_wcet
+    is its WCET on its core's speed, and each core gets its task arrays.
+    """
+    # group once by id instead of scanning every pair
+    tasks_by_comp = defaultdict(list)
+    for task in tasks:
+        tasks_by_comp[task.component_id].append(task)
+    comps_by_core = defaultdict(list)
+    for comp in budgets:
+        comps_by_core[comp.core_id].append(comp)
+
+    # attach tasks → components
+    get_tasks = tasks_by_comp.get
+    for comp in budgets:
+        comp_tasks = comp.tasks = get_tasks(comp.component_id, [])
+        for i, task in enumerate(comp_tasks):
+            task.parent = comp
+            task.index = i
+        comp.is_edf = comp.scheduler == 'EDF'
+        comp.load_task_arrays()
+
+    # attach components → cores
+    get_comps = comps_by_core.get
+    for core in cores:
+        core.is_edf = core.scheduler == 'EDF'
+        core_comps = core.components = get_comps(core.core_id, [])
+        for i, comp in enumerate(core_comps):
+            comp.index = i
+            for task in comp.tasks:
+                task.scaled_wcet = task.wcet / core.speed_factor
+        core.load_task_arrays()
+
+    return cores